@@ -1,324 +1,633 @@
 import streamlit as st
-from streamlit_option_menu import option_menu
 import sqlite3
+import atexit
 import pandas as pd
+import numpy as np
 import json
 import datetime
-import random
 import io
-import openpyxl
-from openpyxl.styles import Font
-import os
+import threading
+import contextlib
+from create_local_db import DB_FILENAME, configure_connection, create_schema
+
+# --- JSON ---
+# orjson handles the JSON columns and the generated payloads when installed;
+# the stdlib json module produces the same compact output otherwise
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _dumps_bytes = orjson.dumps
+    _loads = orjson.loads
+else:
+    def _dumps_bytes(obj):
+        return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode()
+
+    _loads = json.loads
+
+def _dumps(obj):
+    """Serializes obj to a compact JSON string for the TEXT columns."""
+    return _dumps_bytes(obj).decode()
 
 # --- LOCAL SQLITE DATABASE SETUP ---
 
-def get_db_connection():
-    """Establishes a connection to the local SQLite database."""
-    conn = sqlite3.connect('local_data.db')
+# Every statement the helpers run. Keeping each as one module-level string
+# means the connection's statement cache reuses the same prepared statement.
+_SQL_FIND_ASSET_TYPE = 'SELECT id FROM asset_types WHERE LOWER(name) = ?'
+_SQL_INSERT_ASSET_TYPE = 'INSERT INTO asset_types (name) VALUES (?)'
+_SQL_LIST_ASSET_TYPES = 'SELECT name FROM asset_types ORDER BY name ASC'
+_SQL_INSERT_DATA_POINT = (
+    'INSERT INTO data_points (name, identifiers, asset_types, data_type, range_min, range_max, string_options) '
+    'VALUES (?, ?, ?, ?, ?, ?, ?)'
+)
+_SQL_UPSERT_DATA_POINT = (
+    _SQL_INSERT_DATA_POINT + ' '
+    'ON CONFLICT(name) DO UPDATE SET identifiers = excluded.identifiers, asset_types = excluded.asset_types, data_type = excluded.data_type, '
+    'range_min = excluded.range_min, range_max = excluded.range_max, string_options = excluded.string_options'
+)
+_SQL_UPDATE_DATA_POINT = (
+    'UPDATE data_points SET name = ?, identifiers = ?, asset_types = ?, data_type = ?, range_min = ?, range_max = ?, string_options = ? '
+    'WHERE id = ?'
+)
+_SQL_LIST_DATA_POINTS = (
+    'SELECT id, name, identifiers, asset_types, data_type, range_min, range_max, string_options '
+    'FROM data_points ORDER BY id DESC LIMIT ? OFFSET ?'
+)
+_SQL_COUNT_DATA_POINTS = 'SELECT COUNT(*) FROM data_points'
+_SQL_DATA_POINTS_BY_ASSET_TYPES = """
+    SELECT dat.asset_type, dp.id, dp.name,
+           json_extract(CASE WHEN json_valid(dp.identifiers) THEN dp.identifiers END, '$[0]') AS first_identifier,
+           dp.data_type, dp.range_min, dp.range_max, dp.string_options
+    FROM data_point_asset_types AS dat
+    JOIN data_points AS dp ON dp.id = dat.dp_id
+    WHERE dat.asset_type IN (SELECT value FROM json_each(?))
+    ORDER BY dp.id
+"""
+_SQL_GET_DATA_POINT_BY_ID = 'SELECT * FROM data_points WHERE id = ?'
+_SQL_GET_DATA_POINT_BY_NAME = 'SELECT * FROM data_points WHERE name = ?'
+_SQL_DELETE_ALL_DATA_POINTS = 'DELETE FROM data_points'
+_SQL_IDENTIFIER_CLASH = """
+    SELECT candidate.value FROM json_each(?) AS candidate
+    WHERE EXISTS (
+        SELECT 1 FROM data_point_identifiers AS existing
+        WHERE existing.identifier = candidate.value AND existing.dp_id IS NOT ?
+    )
+    ORDER BY candidate.key
+    LIMIT 1
+"""
+
+def _open_db_connection():
+    """Opens a connection to the local database tuned by configure_connection()."""
+    # isolation_level=None: no implicit transactions; writers open their own
+    # BEGIN IMMEDIATE through write_transaction()
+    conn = sqlite3.connect(DB_FILENAME, check_same_thread=False, cached_statements=256, isolation_level=None)
     conn.row_factory = sqlite3.Row
+    configure_connection(conn)
+    return conn
+
+def _release_db_connection(conn):
+    """
+    on_release hook for get_db_connection(). Other sessions may still be
+    mid-query on the released connection, so it isn't closed here; it closes
+    itself once the last of them drops its reference.
+    """
+    atexit.unregister(conn.close)
+
+@st.cache_resource(on_release=_release_db_connection)
+def get_db_connection():
+    """
+    Returns the process-wide read connection to the local SQLite database.
+    Cached with st.cache_resource so every rerun and session reuses the same
+    handle (and its page cache) instead of reconnecting per call. Writes go
+    through write_transaction() on a separate connection, so under WAL the
+    reads never see a write that hasn't committed.
+    """
+    conn = _open_db_connection()
+    conn.execute('PRAGMA query_only = ON')
+    atexit.register(conn.close)
     return conn
 
+class _DatabaseWriter:
+    """
+    The process-wide write connection and the lock serializing its
+    transactions, since Streamlit runs each session's script in its own
+    thread. Closed when st.cache_resource releases it or the process exits,
+    which lets SQLite checkpoint and remove the WAL file.
+    """
+
+    def __init__(self):
+        self.conn = _open_db_connection()
+        # Long-lived connection: let SQLite analyze whatever tables need it now
+        self.conn.execute('PRAGMA optimize = 0x10002')
+        self.lock = threading.Lock()
+        self.closed = False
+        atexit.register(self.close)
+
+    def close(self):
+        """Waits for any running write, refreshes planner statistics and closes."""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            # SQLite recommends an optimize before closing
+            try:
+                self.conn.execute('PRAGMA optimize')
+            except sqlite3.Error:
+                pass  # e.g. the database is busy; closing matters more
+            self.conn.close()
+
+    def release(self):
+        """on_release hook for _get_db_writer()."""
+        atexit.unregister(self.close)
+        self.close()
+
+@st.cache_resource(on_release=lambda writer: writer.release())
+def _get_db_writer():
+    """Returns the process-wide _DatabaseWriter."""
+    return _DatabaseWriter()
+
+@contextlib.contextmanager
+def write_transaction():
+    """
+    Holds the write lock and runs the block in one BEGIN IMMEDIATE transaction
+    on the write connection, which is yielded. Commits on success; rolls back
+    and re-raises on any exception.
+    """
+    writer = _get_db_writer()
+    writer.lock.acquire()
+    # A cache clear may have released this writer before we got its lock
+    while writer.closed:
+        writer.lock.release()
+        writer = _get_db_writer()
+        writer.lock.acquire()
+    try:
+        conn = writer.conn
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+    finally:
+        writer.lock.release()
+
 def init_db():
     """Initializes the local database and creates tables if they don't exist."""
-    conn = get_db_connection()
-    cursor = conn.cursor()
+    with write_transaction() as conn:
+        create_schema(conn.cursor())
 
-    # Create asset_types table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS asset_types (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL UNIQUE
-        )
-    ''')
-    
-    # Create data_points table
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS data_points (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL UNIQUE,
-            identifiers TEXT,
-            asset_types TEXT,
-            data_type TEXT NOT NULL,
-            range_min REAL,
-            range_max REAL,
-            string_options TEXT
-        )
-    ''')
-
-    # Populate asset_types with default values if empty
-    cursor.execute("SELECT COUNT(*) FROM asset_types")
-    if cursor.fetchone()[0] == 0:
-        default_types = ["DG", "HVAC", "SOLAR Inverter", "Sub-Meter", "Temp Sensor", "Hum Sensor"]
-        for asset_type in default_types:
-            conn.execute("INSERT INTO asset_types (name) VALUES (?)", (asset_type,))
-    
-    conn.commit()
-    conn.close()
+@st.cache_resource
+def _init_db_cached():
+    """Runs init_db() once per Streamlit server process instead of on every rerun."""
+    init_db()
+    return True
 
 
 def add_asset_type(name):
     """Adds a new asset type to the local database."""
     try:
-        conn = get_db_connection()
-        cursor = conn.cursor()
-        # Case-insensitive check
-        cursor.execute("SELECT id FROM asset_types WHERE LOWER(name) = ?", (name.lower(),))
-        if cursor.fetchone():
-            return False  # Duplicate
-
-        cursor.execute("INSERT INTO asset_types (name) VALUES (?)", (name,))
-        conn.commit()
+        with write_transaction() as conn:
+            cursor = conn.cursor()
+            # Case-insensitive check
+            cursor.execute(_SQL_FIND_ASSET_TYPE, (name.lower(),))
+            if cursor.fetchone():
+                return False  # Duplicate
+
+            cursor.execute(_SQL_INSERT_ASSET_TYPE, (name,))
+        _cached_get_all_asset_types.clear()
         return True
     except sqlite3.Error as e:
         st.error(f"Database error: {e}")
         return False
-    finally:
-        if conn:
-            conn.close()
 
 def get_all_asset_types():
     """Fetches all asset type names from the local database."""
     conn = get_db_connection()
     try:
-        types = conn.execute('SELECT name FROM asset_types ORDER BY name ASC').fetchall()
+        types = conn.execute(_SQL_LIST_ASSET_TYPES).fetchall()
         return [row['name'] for row in types]
     except sqlite3.Error as e:
         st.error(f"Database error: {e}")
         return []
-    finally:
-        if conn:
-            conn.close()
 
 def add_data_point(name, identifiers, asset_types, data_type, range_min, range_max, string_options):
     """Adds a new data point to the local database."""
-    conn = get_db_connection()
     try:
-        conn.execute(
-            'INSERT INTO data_points (name, identifiers, asset_types, data_type, range_min, range_max, string_options) VALUES (?, ?, ?, ?, ?, ?, ?)',
-            (name, json.dumps(identifiers), json.dumps(asset_types), data_type, range_min, range_max, string_options)
-        )
-        conn.commit()
+        with write_transaction() as conn:
+            conn.execute(
+                _SQL_INSERT_DATA_POINT,
+                (name, _dumps(identifiers), _dumps(asset_types), data_type, range_min, range_max, string_options)
+            )
+        _clear_data_point_caches()
     except sqlite3.Error as e:
         st.error(f"Database error: {e}")
-    finally:
-        if conn:
-            conn.close()
 
 
 def update_data_point(dp_id, name, identifiers, asset_types, data_type, range_min, range_max, string_options):
-    """Updates an existing data point in the local database by its ID."""
-    conn = get_db_connection()
+    """
+    Updates an existing data point in the local database by its ID. The
+    identifier clash check and the UPDATE share one locked transaction.
+    Returns the clashing identifier (nothing is written) or None.
+    """
     try:
-        conn.execute(
-            'UPDATE data_points SET name = ?, identifiers = ?, asset_types = ?, data_type = ?, range_min = ?, range_max = ?, string_options = ? WHERE id = ?',
-            (name, json.dumps(identifiers), json.dumps(asset_types), data_type, range_min, range_max, string_options, dp_id)
-        )
-        conn.commit()
+        with write_transaction() as conn:
+            duplicate = _find_identifier_clash(conn, identifiers, dp_id)
+            if duplicate:
+                return duplicate
+            conn.execute(
+                _SQL_UPDATE_DATA_POINT,
+                (name, _dumps(identifiers), _dumps(asset_types), data_type, range_min, range_max, string_options, dp_id)
+            )
+        _clear_data_point_caches()
     except sqlite3.Error as e:
         st.error(f"Database error: {e}")
-    finally:
-        if conn:
-            conn.close()
+    return None
 
-def update_data_point_by_name(name, identifiers, asset_types, data_type, range_min, range_max, string_options):
-    """Updates an existing data point in the local database by its name."""
-    conn = get_db_connection()
+def bulk_upsert_data_points(rows):
+    """
+    Adds or updates (matched on name) many data points in a single transaction.
+    Each row is a (name, identifiers, asset_types, data_type, range_min,
+    range_max, string_options) tuple.
+    """
     try:
-        conn.execute(
-            'UPDATE data_points SET identifiers = ?, asset_types = ?, data_type = ?, range_min = ?, range_max = ?, string_options = ? WHERE name = ?',
-            (json.dumps(identifiers), json.dumps(asset_types), data_type, range_min, range_max, string_options, name)
-        )
-        conn.commit()
+        with write_transaction() as conn:
+            conn.executemany(
+                _SQL_UPSERT_DATA_POINT,
+                [(name, _dumps(identifiers), _dumps(asset_types), data_type, range_min, range_max, string_options)
+                 for name, identifiers, asset_types, data_type, range_min, range_max, string_options in rows]
+            )
+        _clear_data_point_caches()
     except sqlite3.Error as e:
         st.error(f"Database error: {e}")
-    finally:
-        if conn:
-            conn.close()
 
 
-def get_all_data_points():
-    """Fetches all data points and their column names from the local database."""
+def get_all_data_points(limit=-1, offset=0):
+    """
+    Fetches data points (newest first) and their column names from the local
+    database. `limit` and `offset` select one page; the default is every row.
+    """
     conn = get_db_connection()
     try:
         cursor = conn.cursor()
-        cursor.execute('SELECT * FROM data_points ORDER BY id DESC')
+        # Names the listing's columns explicitly rather than relying on SELECT *
+        cursor.execute(_SQL_LIST_DATA_POINTS, (limit, offset))
         data_points = cursor.fetchall()
         columns = [description[0] for description in cursor.description] if cursor.description else []
         return data_points, columns
     except sqlite3.Error as e:
         st.error(f"Database error: {e}")
         return [], []
-    finally:
-        if conn:
-            conn.close()
+
+
+def count_data_points():
+    """Returns the number of data points in the local database."""
+    conn = get_db_connection()
+    try:
+        return conn.execute(_SQL_COUNT_DATA_POINTS).fetchone()[0]
+    except sqlite3.Error as e:
+        st.error(f"Database error: {e}")
+        return 0
 
 
 def get_data_points_by_asset_type(target_asset_type):
     """Fetches all data points associated with a specific asset type from local DB."""
+    return get_data_points_by_asset_types([target_asset_type]).get(target_asset_type, [])
+
+
+def get_data_points_by_asset_types(target_asset_types):
+    """
+    Fetches the data points for several asset types in one query.
+    Returns a dict mapping each requested asset type to its matching data
+    points, each a plain dict of the columns the generators read plus its
+    packet 'key' (see data_point_key()).
+    """
     conn = get_db_connection()
     try:
-        all_dps = conn.execute('SELECT * FROM data_points').fetchall()
-        
-        matching_dps = []
-        for dp in all_dps:
-            asset_types = json.loads(dp['asset_types'] or '[]')
-            if target_asset_type in asset_types:
-                matching_dps.append(dp)
+        # The data_point_asset_types index picks the matching rows, so only
+        # those (and only the columns the generators read) come back to Python.
+        # Plain tuples are unpacked positionally instead of via sqlite3.Row, and
+        # SQLite extracts the first identifier so no JSON is parsed here.
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(_SQL_DATA_POINTS_BY_ASSET_TYPES, (_dumps(list(target_asset_types)),))
+
+        matching_dps = {asset_type: [] for asset_type in target_asset_types}
+        for asset_type, dp_id, name, first_identifier, data_type, range_min, range_max, string_options in cursor:
+            matching_dps[asset_type].append({
+                "id": dp_id,
+                "name": name,
+                "key": data_point_key(first_identifier, name),
+                "data_type": data_type,
+                "range_min": range_min,
+                "range_max": range_max,
+                "string_options": string_options,
+            })
         return matching_dps
-    except (sqlite3.Error, json.JSONDecodeError) as e:
+    except sqlite3.Error as e:
         st.error(f"Error fetching data points by asset type: {e}")
-        return []
-    finally:
-        if conn:
-            conn.close()
+        return {}
 
 
 def get_data_point_by_id(dp_id):
     """Fetches a single data point by its ID from the local database."""
     conn = get_db_connection()
     try:
-        dp = conn.execute('SELECT * FROM data_points WHERE id = ?', (dp_id,)).fetchone()
+        dp = conn.execute(_SQL_GET_DATA_POINT_BY_ID, (dp_id,)).fetchone()
         return dp
     except sqlite3.Error as e:
         st.error(f"Database error: {e}")
         return None
-    finally:
-        if conn:
-            conn.close()
 
 def get_data_point_by_name(name):
     """Fetches a single data point by its name from the local database."""
     conn = get_db_connection()
     try:
-        dp = conn.execute('SELECT * FROM data_points WHERE name = ?', (name,)).fetchone()
+        dp = conn.execute(_SQL_GET_DATA_POINT_BY_NAME, (name,)).fetchone()
         return dp
     except sqlite3.Error as e:
         st.error(f"Database error: {e}")
         return None
-    finally:
-        if conn:
-            conn.close()
 
 def delete_all_data_points():
     """Deletes all records from the data_points table in the local database."""
-    conn = get_db_connection()
     try:
-        conn.execute('DELETE FROM data_points')
-        conn.commit()
+        with write_transaction() as conn:
+            conn.execute(_SQL_DELETE_ALL_DATA_POINTS)
+        _clear_data_point_caches()
     except sqlite3.Error as e:
         st.error(f"Database error: {e}")
-    finally:
-        if conn:
-            conn.close()
+
+def _find_identifier_clash(conn, identifiers, current_dp_id):
+    """
+    Returns the first of `identifiers` (in the order given) already used by a
+    data point other than `current_dp_id`, or None. Each candidate is probed
+    against the indexed data_point_identifiers table.
+    """
+    if not identifiers:
+        return None
+    row = conn.execute(_SQL_IDENTIFIER_CLASH, (_dumps(identifiers), current_dp_id)).fetchone()
+    return row[0] if row else None
 
 def check_identifier_uniqueness(identifiers, current_dp_id=None):
     """
     Checks if any of the given identifiers already exist in the local database.
+    Returns the first clashing identifier (in the order given) or None.
     """
-    conn = get_db_connection()
     try:
-        query = 'SELECT id, identifiers FROM data_points'
-        all_dps = conn.execute(query).fetchall()
-
-        for identifier in identifiers:
-            for row in all_dps:
-                if current_dp_id is not None and row['id'] == current_dp_id:
-                    continue
-                
-                if row['identifiers']:
-                    try:
-                        existing_identifiers = json.loads(row['identifiers'])
-                        if identifier in existing_identifiers:
-                            return identifier
-                    except json.JSONDecodeError:
-                        continue
-        return None
+        return _find_identifier_clash(get_db_connection(), identifiers, current_dp_id)
     except sqlite3.Error as e:
         st.error(f"Database error: {e}")
         return "Error"
-    finally:
-        if conn:
-            conn.close()
+
+# --- CACHED READS ---
+# Streamlit reruns the whole script on every widget interaction, so the list
+# reads are served from st.cache_data. Every write clears the matching cache.
+# The TTL only bounds staleness from writes made outside this app.
+_CACHE_TTL_SECONDS = 300
+
+@st.cache_data(ttl=_CACHE_TTL_SECONDS, show_spinner=False)
+def _cached_get_all_asset_types():
+    return get_all_asset_types()
+
+@st.cache_data(ttl=_CACHE_TTL_SECONDS, show_spinner=False)
+def _cached_get_all_data_points(limit=-1, offset=0):
+    data_points, columns = get_all_data_points(limit, offset)
+    # sqlite3.Row can't be pickled into the cache, so store plain dicts
+    return [dict(row) for row in data_points], columns
+
+@st.cache_data(ttl=_CACHE_TTL_SECONDS, show_spinner=False)
+def _cached_count_data_points():
+    return count_data_points()
+
+@st.cache_data(ttl=_CACHE_TTL_SECONDS, show_spinner=False)
+def _cached_get_data_points_by_asset_type(target_asset_type):
+    return get_data_points_by_asset_type(target_asset_type)
+
+@st.cache_data(ttl=_CACHE_TTL_SECONDS, show_spinner=False)
+def _cached_get_data_points_by_asset_types(target_asset_types):
+    return get_data_points_by_asset_types(target_asset_types)
+
+@st.cache_data(ttl=_CACHE_TTL_SECONDS, show_spinner=False)
+def _cached_get_data_point_by_id(dp_id):
+    dp = get_data_point_by_id(dp_id)
+    return dict(dp) if dp is not None else None
+
+def _clear_data_point_caches():
+    """Invalidates every cached data point read after a write."""
+    _cached_get_data_point_by_id.clear()
+    _cached_get_all_data_points.clear()
+    _cached_count_data_points.clear()
+    _cached_get_data_points_by_asset_type.clear()
+    _cached_get_data_points_by_asset_types.clear()
 
 # --- HELPER FUNCTIONS ---
 def format_list_for_display(items):
     if not items:
         return ""
     if isinstance(items, str):
+        # Fast path for the stored flat list of plain strings, e.g. '["a","b"]';
+        # anything with escapes or non-string elements goes through the parser
+        if items.startswith('["') and items.endswith('"]') and '\\' not in items:
+            joined = items[2:-2].replace('", "', ', ').replace('","', ', ')
+            if '"' not in joined:
+                return joined
         try:
-            items = json.loads(items)
-        except (json.JSONDecodeError, TypeError):
+            items = _loads(items)
+        except json.JSONDecodeError:
             return ""
     if isinstance(items, list):
         return ", ".join(map(str, items))
     return ""
 
-def generate_mock_value(dp):
+def generate_mock_values(dp, count, rng):
+    """
+    Draws `count` mock values for one data point in a single call on the NumPy
+    Generator `rng`. Returns plain Python values so the packets stay
+    JSON-serializable.
+    """
     data_type = dp['data_type']
     if data_type == 'float':
         min_val = dp['range_min'] if dp['range_min'] is not None else 0.0
         max_val = dp['range_max'] if dp['range_max'] is not None else 100.0
-        return round(random.uniform(min_val, max_val), 2)
+        # Same formula as random.uniform, so a reversed range still works
+        return np.round(min_val + (max_val - min_val) * rng.random(count), 2).tolist()
     elif data_type == 'int':
         min_val = int(dp['range_min'] if dp['range_min'] is not None else 0)
         max_val = int(dp['range_max'] if dp['range_max'] is not None else 100)
-        return random.randint(min_val, max_val)
+        return rng.integers(min_val, max_val, size=count, endpoint=True).tolist()
     elif data_type == 'boolean':
-        return random.choice([True, False])
+        return (rng.random(count) < 0.5).tolist()
     elif data_type == 'string':
         if 'string_options' in dp.keys() and dp['string_options']:
             options = [opt.strip() for opt in dp['string_options'].split(',')]
-            return random.choice(options)
-        return "Sample String"
-    return None
+            return [options[i] for i in rng.integers(0, len(options), size=count)]
+        return ["Sample String"] * count
+    return [None] * count
 
-def format_timestamp(dt_object):
-    tz = datetime.timezone(datetime.timedelta(hours=5, minutes=30))
-    dt_aware = dt_object.replace(tzinfo=tz)
-    iso_str = dt_aware.strftime('%Y-%m-%dT%H:%M:%S%z')
-    return iso_str
+def data_point_key(first_identifier, name):
+    """
+    Returns the packet key for a data point: its first identifier, else its
+    snake_cased name. Kept in Python so the fallback lowercases like str.lower().
+    """
+    return first_identifier if first_identifier is not None else name.replace(" ", "_").lower()
+
+# Packet timestamps are local IST wall-clock times with an explicit offset
+IST = datetime.timezone(datetime.timedelta(hours=5, minutes=30))
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S%z'
+
+def format_timestamps(start, count, frequency):
+    """
+    Formats `count` evenly spaced times starting at `start` in one pandas pass
+    instead of one strftime per packet.
+    """
+    timestamps = pd.date_range(start, periods=count, freq=frequency).tz_localize(IST)
+    return timestamps.strftime(TIMESTAMP_FORMAT).tolist()
+
+def format_offset_timestamps(start, seconds):
+    """
+    Formats `start` plus each offset in the array `seconds`, all in one pandas
+    pass. Sub-second parts are dropped by the format, as with strftime().
+    """
+    timestamps = (pd.Timestamp(start) + pd.to_timedelta(seconds, unit='s')).tz_localize(IST)
+    return timestamps.strftime(TIMESTAMP_FORMAT).tolist()
+
+def iter_sample_packets(pld_id, keys, value_columns, timestamps):
+    """
+    Yields the Generator page's packets one at a time from precomputed
+    timestamp strings and per-data-point value columns. The columns are
+    transposed into rows with one zip() rather than indexed cell by cell.
+    """
+    # Every header field but tms/seqid/ext is fixed for the run; the None
+    # placeholders keep the key order of the emitted JSON unchanged
+    template = {
+        "ver": "1.0",
+        "pld": pld_id,
+        "svc": "svc33338597",
+        "aid": "A173378384",
+        "eid": "2109801",
+        "dvt": "jvt1443",
+        "dvm": "JVT1443",
+        "evt": "EV",
+        "tms": None,
+        "evc": "300",
+        "seqid": None,
+        "alt": None,
+        "ext": None
+    }
+    for i, (timestamp, *values) in enumerate(zip(timestamps, *value_columns)):
+        sii_data = {
+            "tmsp": timestamp,
+            "evc": 300,
+            "tms": timestamp
+        }
+        sii_data.update(zip(keys, values))
+
+        packet = template.copy()
+        packet["tms"] = timestamp
+        packet["seqid"] = i + 1
+        packet["ext"] = [{"ver": "3.0", "sii": {"1": sii_data}}]
+        yield packet
+
+def write_json_array(packets):
+    """
+    Serializes an iterable of packets into JSON array bytes one packet at a
+    time, so the full packet list and a serialized copy of it never have to
+    exist together. Each packet is written compactly on its own line.
+    Returns (json_bytes, packet_count, first_packet).
+    """
+    buffer = io.BytesIO()
+    buffer.write(b"[")
+    packet_count = 0
+    first_packet = None
+    for packet in packets:
+        if packet_count:
+            buffer.write(b",\n")
+        else:
+            first_packet = packet
+            buffer.write(b"\n")
+        buffer.write(_dumps_bytes(packet))
+        packet_count += 1
+    buffer.write(b"\n]" if packet_count else b"]")
+    return buffer.getvalue(), packet_count, first_packet
 
 # --- BULK UPLOAD FUNCTIONS ---
-def validate_bulk_upload(df):
+def validate_bulk_upload(df, available_asset_types):
     errors = []
     required_columns = ["name", "identifiers", "asset_types", "data_type"]
     valid_data_types = ["float", "int", "boolean", "string"]
-    available_asset_types = get_all_asset_types()
-    
-    existing_points_df, _ = get_all_data_points()
-    existing_names = [row['name'] for row in existing_points_df]
     
-    for col in required_columns:
-        if col not in df.columns:
-            errors.append(f"Missing required column: '{col}'")
-            return errors, None
-
-    for i, row in df.iterrows():
-        for col in required_columns:
-            if pd.isna(row[col]):
-                errors.append(f"Row {i+2}: Missing value in required column '{col}'.")
-        
-        if row['data_type'] not in valid_data_types:
-            errors.append(f"Row {i+2}: Invalid data_type '{row['data_type']}'. Must be one of {valid_data_types}.")
-            
-        asset_types = [atype.strip() for atype in str(row['asset_types']).split(',')]
-        for atype in asset_types:
-            if atype not in available_asset_types:
-                errors.append(f"Row {i+2}: Asset type '{atype}' is not valid. Available types are: {available_asset_types}.")
-        
+    # Every missing column is reported at once, in required_columns order
+    present_columns = set(df.columns)
+    missing_columns = [col for col in required_columns if col not in present_columns]
+    if missing_columns:
+        errors.extend(f"Missing required column: '{col}'" for col in missing_columns)
+        return errors, None
+
+    # Checks run column-wise; each message is tagged with its row position and
+    # stably sorted at the end so errors still read row by row.
+    labels = df.index
+    row_errors = []
+
+    missing = df[required_columns].isna().to_numpy()
+    for pos, col_pos in zip(*missing.nonzero()):
+        row_errors.append((pos, f"Row {labels[pos]+2}: Missing value in required column '{required_columns[col_pos]}'."))
+
+    # The messages quote cells as the old iterrows() loop saw them: in the
+    # frame's common dtype (an int 1 reads 1.0 when every column is numeric)
+    cells = df.to_numpy()
+    data_types = pd.Series(cells[:, df.columns.get_loc('data_type')])
+    for pos in (~data_types.isin(valid_data_types)).to_numpy().nonzero()[0]:
+        row_errors.append((pos, f"Row {labels[pos]+2}: Invalid data_type '{data_types.iloc[pos]}'. Must be one of {valid_data_types}."))
+
+    # One entry per (row position, asset type) pair. map(str) converts each
+    # cell like the old str(row['asset_types']) did; astype(str) keeps NaN
+    # under pandas 3, and an all-blank column is read as float64
+    asset_types = pd.Series(cells[:, df.columns.get_loc('asset_types')]).map(str).str.split(',').explode().str.strip()
+    invalid_assets = asset_types[~asset_types.isin(available_asset_types)]
+    for pos, atype in invalid_assets.items():
+        row_errors.append((pos, f"Row {labels[pos]+2}: Asset type '{atype}' is not valid. Available types are: {available_asset_types}."))
+
+    row_errors.sort(key=lambda error: error[0])
+    errors.extend(message for _, message in row_errors)
+
     return errors, df
 
 # --- UI PAGES ---
 
+# Static Home page content, rendered as one Markdown element; Markdown
+# headings keep the theme's heading styles and anchor links
+_HOME_MARKDOWN = """
+# Home
+
+## Welcome to the App!
+
+Select an option from the menu to get started.
+"""
+
 def home_page():
-    st.title("Home")
-    st.header("Welcome to the App!")
-    st.write("Select an option from the menu to get started.")
+    st.markdown(_HOME_MARKDOWN)
+
+# Rows per page of the Existing Data Points table
+_DATA_POINTS_PAGE_SIZE = 25
+
+def _close_edit_form():
+    """Leaves edit mode and clears the Existing Data Points row selection."""
+    st.session_state.editing_dp_id = None
+    st.session_state.editing_dp_row = None
+    # The table is keyed on this version, so bumping it drops the old
+    # selection and the same row can be picked again with one click
+    st.session_state.data_points_table_version = st.session_state.get("data_points_table_version", 0) + 1
 
 def data_points_page():
     st.title("Data Points")
     st.header("Data Points Management")
 
+    # Fetched once per rerun and shared by bulk validation and the forms below
+    asset_type_options = _cached_get_all_asset_types()
+
     with st.expander("Manage Asset Types"):
         with st.form("new_asset_type_form", clear_on_submit=True):
             new_asset_name = st.text_input("New Asset Type Name")
@@ -340,17 +649,15 @@ def data_points_page():
                     data_io = io.StringIO(pasted_data)
                     df = pd.read_csv(data_io, sep='\t')
                     
-                    errors, validated_df = validate_bulk_upload(df)
+                    errors, validated_df = validate_bulk_upload(df, asset_type_options)
                     
                     if errors:
                         st.error("Validation failed. Please fix the following errors:")
-                        for error in errors:
-                            st.write(f"- {error}")
+                        # One element for the whole list rather than an st.write per error
+                        st.dataframe(pd.DataFrame({"Error": errors}), use_container_width=True, hide_index=True)
                     else:
                         st.success("Data validation successful! Processing records...")
-                        existing_points_df, _ = get_all_data_points()
-                        existing_names = [row['name'] for row in existing_points_df]
-
+                        rows = []
                         for i, row in validated_df.iterrows():
                             name = row['name']
                             identifiers = [iden.strip() for iden in str(row['identifiers']).split(',')]
@@ -360,11 +667,10 @@ def data_points_page():
                             range_max = row.get('range_max') if pd.notna(row.get('range_max')) else None
                             string_options = row.get('string_options') if pd.notna(row.get('string_options')) else None
 
-                            if name in existing_names:
-                                update_data_point_by_name(name, identifiers, asset_types, data_type, range_min, range_max, string_options)
-                            else:
-                                add_data_point(name, identifiers, asset_types, data_type, range_min, range_max, string_options)
-                        
+                            rows.append((name, identifiers, asset_types, data_type, range_min, range_max, string_options))
+
+                        # Existing names are updated, new ones inserted, in one transaction
+                        bulk_upsert_data_points(rows)
                         st.success("Bulk processing complete!")
                         st.rerun()
 
@@ -380,8 +686,6 @@ def data_points_page():
             st.success("All data points have been deleted.")
             st.rerun()
 
-    asset_type_options = get_all_asset_types()
-
     if "show_add_form" not in st.session_state:
         st.session_state.show_add_form = False
     if "editing_dp_id" not in st.session_state:
@@ -389,7 +693,11 @@ def data_points_page():
 
     if st.session_state.editing_dp_id is not None:
         st.subheader("Editing Data Point")
-        dp_to_edit = get_data_point_by_id(st.session_state.editing_dp_id)
+        # Selecting a table row stashes that row; only fall back to a lookup
+        # if that's missing (e.g. editing_dp_id set some other way)
+        dp_to_edit = st.session_state.get("editing_dp_row")
+        if dp_to_edit is None or dp_to_edit['id'] != st.session_state.editing_dp_id:
+            dp_to_edit = _cached_get_data_point_by_id(st.session_state.editing_dp_id)
         
         data_type_options = ["float", "int", "boolean", "string"]
         data_type_index = data_type_options.index(dp_to_edit['data_type']) if dp_to_edit['data_type'] in data_type_options else 0
@@ -413,7 +721,7 @@ def data_points_page():
             elif data_type == 'string':
                 string_options = st.text_input("String Options (comma-separated)", value=string_options_val or "")
 
-            asset_types_default = json.loads(dp_to_edit['asset_types'] or '[]')
+            asset_types_default = _loads(dp_to_edit['asset_types'] or '[]')
             asset_types = st.multiselect(
                 "Asset Type(s)",
                 asset_type_options,
@@ -425,18 +733,17 @@ def data_points_page():
                 submitted = st.form_submit_button("Update Data Point")
             with col_cancel:
                 if st.form_submit_button("Cancel", use_container_width=True):
-                    st.session_state.editing_dp_id = None
+                    _close_edit_form()
                     st.rerun()
 
             if submitted:
                 identifiers = [identifier.strip() for identifier in dp_identifiers_str.split(',') if identifier.strip()]
-                duplicate = check_identifier_uniqueness(identifiers, current_dp_id=st.session_state.editing_dp_id)
+                duplicate = update_data_point(st.session_state.editing_dp_id, dp_to_edit['name'], identifiers, asset_types, data_type, range_min, range_max, string_options)
                 if duplicate:
                     st.error(f"Identifier '{duplicate}' is already in use. Please choose a unique identifier.")
                 else:
-                    update_data_point(st.session_state.editing_dp_id, dp_to_edit['name'], identifiers, asset_types, data_type, range_min, range_max, string_options)
                     st.success("Data point updated successfully!")
-                    st.session_state.editing_dp_id = None
+                    _close_edit_form()
                     st.rerun()
 
     elif st.session_state.show_add_form:
@@ -491,44 +798,64 @@ def data_points_page():
     st.divider()
 
     st.subheader("Existing Data Points")
-    all_points, columns = get_all_data_points()
+    # Only the current page is read from SQLite and rendered
+    total_points = _cached_count_data_points()
+    page_count = max(1, -(-total_points // _DATA_POINTS_PAGE_SIZE))
+    page = 1
+    if page_count > 1:
+        page = st.number_input("Page", min_value=1, max_value=page_count, value=1, step=1)
+    offset = (page - 1) * _DATA_POINTS_PAGE_SIZE
+    all_points, columns = _cached_get_all_data_points(_DATA_POINTS_PAGE_SIZE, offset)
 
     if not all_points:
         st.info("No data points found. Click 'Add New Data Point' to get started.")
     else:
-        header_cols = st.columns([3, 3, 3, 2, 2, 1])
-        headers = ["Data Point Name", "Identifiers", "Asset Types", "Data Type", "Range/Options", "Actions"]
-        for col, header in zip(header_cols, headers):
-            col.markdown(f"**{header}**")
-        
-        for point in all_points:
-            row_cols = st.columns([3, 3, 3, 2, 2, 1])
-            row_cols[0].write(point['name'])
-            row_cols[1].write(format_list_for_display(point['identifiers']))
-            row_cols[2].write(format_list_for_display(point['asset_types']))
-            row_cols[3].write(point['data_type'])
-            
-            # FIX: Safely access sqlite3.Row object
-            if point['data_type'] in ['float', 'int']:
-                range_str = f"{point['range_min'] if point['range_min'] is not None else 'N/A'} - {point['range_max'] if point['range_max'] is not None else 'N/A'}"
-            elif point['data_type'] == 'string':
-                range_str = point['string_options'] if point['string_options'] else 'N/A'
-            else:
-                range_str = 'N/A'
-            row_cols[4].write(range_str)
-            
-            with row_cols[5]:
-                if st.button("✏️", key=f"edit_{point['id']}", use_container_width=True):
-                    st.session_state.editing_dp_id = point['id']
-                    st.rerun()
-            st.divider()
+        # One dataframe element for the whole table instead of a row of widgets per point
+        points_df = pd.DataFrame(all_points, columns=columns)
+        range_min = points_df['range_min'].astype(object).where(points_df['range_min'].notna(), 'N/A').astype(str)
+        range_max = points_df['range_max'].astype(object).where(points_df['range_max'].notna(), 'N/A').astype(str)
+        string_options = points_df['string_options'].where(points_df['string_options'].fillna('') != '', 'N/A')
+        range_options = np.select(
+            [points_df['data_type'].isin(['float', 'int']), points_df['data_type'] == 'string'],
+            [range_min + " - " + range_max, string_options],
+            default='N/A'
+        )
+        display_df = pd.DataFrame({
+            "Data Point Name": points_df['name'],
+            "Identifiers": points_df['identifiers'].map(format_list_for_display),
+            "Asset Types": points_df['asset_types'].map(format_list_for_display),
+            "Data Type": points_df['data_type'],
+            "Range/Options": range_options,
+        })
+        table_key = f"data_points_table_{page}_{st.session_state.get('data_points_table_version', 0)}"
+
+        def _edit_selected_point():
+            # on_select callbacks only fire when the selection changes, so
+            # closing the edit form doesn't reopen it for the same row
+            rows = st.session_state[table_key].selection.rows
+            if rows:
+                st.session_state.editing_dp_id = all_points[rows[0]]['id']
+                st.session_state.editing_dp_row = all_points[rows[0]]
+                st.session_state.show_add_form = False
+
+        st.caption("Select a row to edit it.")
+        st.dataframe(
+            display_df,
+            use_container_width=True,
+            hide_index=True,
+            key=table_key,
+            on_select=_edit_selected_point,
+            selection_mode="single-row",
+        )
+        if page_count > 1:
+            st.caption(f"Showing {offset + 1}-{offset + len(all_points)} of {total_points} data points.")
 
 
 def generator_page():
     st.title("Sample Data Generator")
     st.header("Generate Mock JSON Data")
 
-    asset_type_options = get_all_asset_types()
+    asset_type_options = _cached_get_all_asset_types()
     if not asset_type_options:
         st.warning("No asset types found. Please add one on the 'Data points' page first.")
         return
@@ -559,7 +886,7 @@ def generator_page():
         else:
             st.info("Generating data... Please wait.")
             
-            matching_dps = get_data_points_by_asset_type(selected_asset_type)
+            matching_dps = _cached_get_data_points_by_asset_type(selected_asset_type)
             
             if not matching_dps:
                 st.warning(f"No data points found for asset type '{selected_asset_type}'. Please add them on the 'Data points' page.")
@@ -567,88 +894,60 @@ def generator_page():
                 start_datetime = datetime.datetime.combine(start_date, start_time)
                 end_datetime = datetime.datetime.combine(end_date, end_time)
 
-                all_packets = []
-                current_time = start_datetime
-                seq_id = 1
-                while current_time <= end_datetime:
-                    sii_data = {
-                        "tmsp": format_timestamp(current_time),
-                        "evc": 300,
-                        "tms": format_timestamp(current_time)
-                    }
-                    for dp in matching_dps:
-                        # FIX: Safely parse JSON from sqlite3.Row
-                        identifiers = json.loads(dp['identifiers'] or '[]')
-                        key = (identifiers[0] if identifiers else dp['name'].replace(" ", "_").lower())
-                        sii_data[key] = generate_mock_value(dp)
-
-                    single_packet_json = {
-                        "ver": "1.0",
-                        "pld": pld_id,
-                        "svc": "svc33338597",
-                        "aid": "A173378384",
-                        "eid": "2109801",
-                        "dvt": "jvt1443",
-                        "dvm": "JVT1443",
-                        "evt": "EV",
-                        "tms": format_timestamp(current_time),
-                        "evc": "300",
-                        "seqid": seq_id,
-                        "alt": None,
-                        "ext": [{"ver": "3.0", "sii": {"1": sii_data}}]
-                    }
-                    all_packets.append(single_packet_json)
-                    
-                    current_time += datetime.timedelta(minutes=frequency_mins)
-                    seq_id += 1
+                frequency = datetime.timedelta(minutes=frequency_mins)
+                num_packets = (end_datetime - start_datetime) // frequency + 1
+
+                # Draw every data point's whole column of values up front
+                rng = np.random.default_rng()
+                keys = [dp['key'] for dp in matching_dps]
+                value_columns = [generate_mock_values(dp, num_packets, rng) for dp in matching_dps]
+                timestamps = format_timestamps(start_datetime, num_packets, frequency)
+
+                packets = iter_sample_packets(pld_id, keys, value_columns, timestamps)
+                json_bytes, packet_count, first_packet = write_json_array(packets)
                 
-                if not all_packets:
+                if not packet_count:
                     st.warning("No packets were generated for the selected time range.")
                 else:
-                    st.success(f"Successfully generated {len(all_packets)} packets!")
+                    st.success(f"Successfully generated {packet_count} packets!")
                     st.subheader("Generated JSON Preview (First Packet)")
-                    st.json(all_packets[0])
-                    json_string = json.dumps(all_packets, indent=4)
+                    st.json(first_packet)
                     st.download_button(
                         label="Download JSON File",
                         file_name=f"{pld_id}_{selected_asset_type}_data.json",
                         mime="application/json",
-                        data=json_string,
+                        data=json_bytes,
                     )
 
 def multi_json_generator_page():
     st.title("Multi JSON Generator")
     st.header("Generate Mixed-Source Mock Data")
 
-    asset_type_options = get_all_asset_types()
+    asset_type_options = _cached_get_all_asset_types()
     if not asset_type_options:
         st.warning("No asset types found. Please add one on the 'Data points' page first.")
         return
 
-    if 'pld_inputs' not in st.session_state:
-        st.session_state.pld_inputs = {}
-
     with st.form("multi_generator_form"):
         st.subheader("Generation Parameters")
         
         selected_asset_types = st.multiselect("Select Asset Types", asset_type_options)
-        
-        for asset_type in selected_asset_types:
-            if asset_type not in st.session_state.pld_inputs:
-                st.session_state.pld_inputs[asset_type] = [""]
 
+        # One editable table per asset type instead of a text input per PLD;
+        # rows are added in place, so there is no "add another" rerun
+        pld_inputs = {}
         for asset_type in selected_asset_types:
             with st.container(border=True):
                 st.markdown(f"**PLDs for {asset_type}**")
-                for i in range(len(st.session_state.pld_inputs[asset_type])):
-                    st.session_state.pld_inputs[asset_type][i] = st.text_input(
-                        f"PLD ID {i+1}", 
-                        value=st.session_state.pld_inputs[asset_type][i], 
-                        key=f"pld_{asset_type}_{i}"
-                    )
-                if st.form_submit_button(f"Add another PLD for {asset_type}", use_container_width=True):
-                    st.session_state.pld_inputs[asset_type].append("")
-                    st.rerun()
+                edited_plds = st.data_editor(
+                    pd.DataFrame({"PLD ID": [""]}),
+                    num_rows="dynamic",
+                    hide_index=True,
+                    use_container_width=True,
+                    column_config={"PLD ID": st.column_config.TextColumn("PLD ID")},
+                    key=f"pld_editor_{asset_type}",
+                )
+                pld_inputs[asset_type] = edited_plds["PLD ID"].tolist()
         
         st.divider()
         col1, col2 = st.columns(2)
@@ -667,82 +966,82 @@ def multi_json_generator_page():
         end_datetime = datetime.datetime.combine(end_date, datetime.time.max)
         total_seconds = (end_datetime - start_datetime).total_seconds()
 
-        for asset_type, plds in st.session_state.pld_inputs.items():
-            if asset_type not in selected_asset_types:
-                continue
+        # One read for every selected asset type instead of one per type
+        dps_by_asset_type = _cached_get_data_points_by_asset_types(tuple(selected_asset_types))
+        rng = np.random.default_rng()
 
-            cleaned_plds = [pld.strip() for pld in plds if pld.strip()]
+        for asset_type, plds in pld_inputs.items():
+            # Rows added in the editor but left blank come back as None
+            cleaned_plds = [pld.strip() for pld in plds if isinstance(pld, str) and pld.strip()]
             if not cleaned_plds:
                 st.error(f"Please provide at least one valid PLD ID for {asset_type}.")
                 has_errors = True
                 continue
             
-            matching_dps = get_data_points_by_asset_type(asset_type)
+            matching_dps = dps_by_asset_type.get(asset_type, [])
             if not matching_dps:
                 st.warning(f"No data points found for asset type '{asset_type}'. Skipping.")
                 continue
 
-            for pld_id in cleaned_plds:
-                num_packets = random.randint(5, 20) 
-                for _ in range(num_packets):
-                    random_seconds = random.uniform(0, total_seconds)
-                    random_timestamp = start_datetime + datetime.timedelta(seconds=random_seconds)
-                    
-                    parameters = {}
-                    for dp in matching_dps:
-                        # FIX: Safely parse JSON from sqlite3.Row
-                        identifiers = json.loads(dp['identifiers'] or '[]')
-                        key = (identifiers[0] if identifiers else dp['name'].replace(" ", "_").lower())
-                        parameters[key] = generate_mock_value(dp)
-
-                    packet = {
-                        "pld": pld_id,
-                        "asset_type": asset_type,
-                        "timestamp": format_timestamp(random_timestamp),
-                        "parameters": parameters
-                    }
-                    all_packets.append(packet)
+            # Draw every packet of this asset type at once: 5-20 per PLD, a
+            # random instant in the range each, and one value column per data point
+            packet_counts = rng.integers(5, 20, size=len(cleaned_plds), endpoint=True)
+            num_packets = int(packet_counts.sum())
+            pld_column = np.repeat(cleaned_plds, packet_counts).tolist()
+            timestamps = format_offset_timestamps(start_datetime, rng.uniform(0, total_seconds, num_packets))
+            keys = [dp['key'] for dp in matching_dps]
+            value_columns = [generate_mock_values(dp, num_packets, rng) for dp in matching_dps]
+
+            all_packets.extend(
+                {
+                    "pld": pld_id,
+                    "asset_type": asset_type,
+                    "timestamp": timestamp,
+                    "parameters": dict(zip(keys, values))
+                }
+                for pld_id, timestamp, *values in zip(pld_column, timestamps, *value_columns)
+            )
 
         if not has_errors and all_packets:
-            random.shuffle(all_packets)
+            all_packets = [all_packets[i] for i in rng.permutation(len(all_packets))]
             
-            st.success(f"Successfully generated {len(all_packets)} mixed packets!")
+            # Serialize first so the packet list can be freed before the
+            # download widget holds on to the bytes
+            json_bytes, packet_count, first_packet = write_json_array(all_packets)
+            del all_packets
+
+            st.success(f"Successfully generated {packet_count} mixed packets!")
             st.subheader("Generated JSON Preview (First Packet)")
-            st.json(all_packets[0])
+            st.json(first_packet)
             
-            json_string = json.dumps(all_packets, indent=4)
             st.download_button(
                 label="Download JSON File",
                 file_name="multi_asset_data.json",
                 mime="application/json",
-                data=json_string,
+                data=json_bytes,
             )
         elif not has_errors:
             st.warning("No packets were generated. Check if the selected asset types have data points.")
 
 
+# --- NAVIGATION ---
+_MENU_LABELS = ("Home", "Data points", "Generator", "Multi JSON Generator")
+_MENU_ICONS = (":material/home:", ":material/database:", ":material/data_object:", ":material/library_books:")
+_MENU_PAGES = (home_page, data_points_page, generator_page, multi_json_generator_page)
+_MENU_DEFAULT_INDEX = 1
+
 def main():
     """This is the main function for the Streamlit app."""
-    with st.sidebar:
-        menu_selection = option_menu(
-            "Main Menu", 
-            ["Home", 'Data points', 'Generator', 'Multi JSON Generator'], 
-            icons=['house', 'database-add', 'file-binary', 'files'], 
-            menu_icon="cast", 
-            default_index=1 
-        )
-
-    if menu_selection == "Home":
-        home_page()
-    elif menu_selection == "Data points":
-        data_points_page()
-    elif menu_selection == "Generator":
-        generator_page()
-    elif menu_selection == "Multi JSON Generator":
-        multi_json_generator_page()
-
-if __name__ == '__main__':
-    # Initialize the local database on startup
-    init_db()
-    main()
+    _init_db_cached()
+
+    # st.navigation renders the sidebar menu and runs only the selected page
+    pg = st.navigation({"Main Menu": [
+        st.Page(page, title=label, icon=icon, default=(i == _MENU_DEFAULT_INDEX))
+        for i, (label, icon, page) in enumerate(zip(_MENU_LABELS, _MENU_ICONS, _MENU_PAGES))
+    ]})
+    pg.run()
+
+# Streamlit executes this file as a script on every rerun; call main()
+# unconditionally so hosts that load it as a module still start the app
+main()
 
@@ -1,56 +1,185 @@
 import sqlite3
 
+DB_FILENAME = 'local_data.db'
+
+DEFAULT_ASSET_TYPES = ["DG", "HVAC", "SOLAR Inverter", "Sub-Meter", "Temp Sensor", "Hum Sensor"]
+
+def configure_connection(conn):
+    """
+    Applies the PRAGMA tuning every connection to the local database uses.
+    Shared by this script and the Streamlit app's get_db_connection().
+    """
+    # WAL lets reads proceed during a write; NORMAL sync is safe under WAL
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.execute('PRAGMA synchronous = NORMAL')
+    conn.execute('PRAGMA temp_store = MEMORY')
+    conn.execute('PRAGMA wal_autocheckpoint = 1000')
+    # Read pages through a memory map instead of read() calls (128 MiB cap)
+    conn.execute('PRAGMA mmap_size = 134217728')
+    # ~20 MB page cache (negative values are KiB)
+    conn.execute('PRAGMA cache_size = -20000')
+
+def create_schema(cursor):
+    """
+    Creates the tables mirroring the Supabase schema if they don't exist and
+    seeds 'asset_types' with any default values it is missing.
+    Returns the number of default asset types inserted (0 if all were present).
+    Everything runs in one transaction that the caller commits.
+    Shared by this script and the Streamlit app's init_db().
+    """
+    if not cursor.connection.in_transaction:
+        cursor.execute('BEGIN')
+
+    # --- Create the asset_types table ---
+    # This table is a simple lookup for asset type names.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS asset_types (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE
+        )
+    ''')
+
+    # add_asset_type() checks for duplicates with LOWER(name) = ?, which the
+    # UNIQUE index on name can't serve; this expression index can
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_asset_types_lower_name
+        ON asset_types (LOWER(name))
+    ''')
+
+    # --- Create the data_points table ---
+    # This table stores the main data point configurations.
+    # 'identifiers' and 'asset_types' will be stored as TEXT containing JSON arrays.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS data_points (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL UNIQUE,
+            identifiers TEXT,
+            asset_types TEXT,
+            data_type TEXT NOT NULL,
+            range_min REAL,
+            range_max REAL,
+            string_options TEXT
+        )
+    ''')
+
+    # --- Create the data_point_identifiers lookup table ---
+    # One row per identifier of each data point, kept in sync by the triggers
+    # below, so identifier clashes are answered from an index instead of by
+    # decoding every 'identifiers' array. Not UNIQUE: the app reports clashes
+    # itself and older databases may already contain some.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS data_point_identifiers (
+            dp_id INTEGER NOT NULL REFERENCES data_points(id) ON DELETE CASCADE,
+            identifier TEXT NOT NULL
+        )
+    ''')
+    cursor.execute('''
+        CREATE INDEX IF NOT EXISTS idx_data_point_identifiers_identifier
+        ON data_point_identifiers (identifier)
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS data_points_identifiers_insert
+        AFTER INSERT ON data_points
+        BEGIN
+            INSERT INTO data_point_identifiers (dp_id, identifier)
+            SELECT NEW.id, value FROM json_each(CASE WHEN json_valid(NEW.identifiers) THEN NEW.identifiers END);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS data_points_identifiers_update
+        AFTER UPDATE OF identifiers ON data_points
+        BEGIN
+            DELETE FROM data_point_identifiers WHERE dp_id = OLD.id;
+            INSERT INTO data_point_identifiers (dp_id, identifier)
+            SELECT NEW.id, value FROM json_each(CASE WHEN json_valid(NEW.identifiers) THEN NEW.identifiers END);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS data_points_identifiers_delete
+        AFTER DELETE ON data_points
+        BEGIN
+            DELETE FROM data_point_identifiers WHERE dp_id = OLD.id;
+        END
+    ''')
+    # Backfill databases created before the lookup table existed
+    cursor.execute('''
+        INSERT INTO data_point_identifiers (dp_id, identifier)
+        SELECT dp.id, je.value
+        FROM data_points AS dp, json_each(CASE WHEN json_valid(dp.identifiers) THEN dp.identifiers END) AS je
+        WHERE NOT EXISTS (SELECT 1 FROM data_point_identifiers)
+    ''')
+
+    # --- Create the data_point_asset_types lookup table ---
+    # One row per (asset type, data point), kept in sync like the identifiers
+    # above, so the generators fetch an asset type's data points with an index
+    # range scan instead of expanding every 'asset_types' array.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS data_point_asset_types (
+            asset_type TEXT NOT NULL,
+            dp_id INTEGER NOT NULL REFERENCES data_points(id) ON DELETE CASCADE,
+            PRIMARY KEY (asset_type, dp_id)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS data_points_asset_types_insert
+        AFTER INSERT ON data_points
+        BEGIN
+            INSERT INTO data_point_asset_types (asset_type, dp_id)
+            SELECT DISTINCT value, NEW.id FROM json_each(CASE WHEN json_valid(NEW.asset_types) THEN NEW.asset_types END);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS data_points_asset_types_update
+        AFTER UPDATE OF asset_types ON data_points
+        BEGIN
+            DELETE FROM data_point_asset_types WHERE dp_id = OLD.id;
+            INSERT INTO data_point_asset_types (asset_type, dp_id)
+            SELECT DISTINCT value, NEW.id FROM json_each(CASE WHEN json_valid(NEW.asset_types) THEN NEW.asset_types END);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS data_points_asset_types_delete
+        AFTER DELETE ON data_points
+        BEGIN
+            DELETE FROM data_point_asset_types WHERE dp_id = OLD.id;
+        END
+    ''')
+    # Backfill databases created before the lookup table existed
+    cursor.execute('''
+        INSERT INTO data_point_asset_types (asset_type, dp_id)
+        SELECT DISTINCT je.value, dp.id
+        FROM data_points AS dp, json_each(CASE WHEN json_valid(dp.asset_types) THEN dp.asset_types END) AS je
+        WHERE NOT EXISTS (SELECT 1 FROM data_point_asset_types)
+    ''')
+
+    # --- Populate asset_types with any missing default values ---
+    # Idempotent, and case-insensitive like add_asset_type(): a default is
+    # skipped if any casing of it is already present
+    cursor.executemany(
+        "INSERT INTO asset_types (name) SELECT ? WHERE NOT EXISTS (SELECT 1 FROM asset_types WHERE LOWER(name) = LOWER(?))",
+        [(t, t) for t in DEFAULT_ASSET_TYPES]
+    )
+    return cursor.rowcount
+
 def initialize_local_database():
     """
     Connects to a local SQLite database file and creates the necessary tables
     mirroring the Supabase schema.
     """
-    db_filename = 'local_data.db'
+    conn = None
     try:
         # Connect to the database. This will create the file if it doesn't exist.
-        conn = sqlite3.connect(db_filename)
+        conn = sqlite3.connect(DB_FILENAME)
+        configure_connection(conn)
         cursor = conn.cursor()
-        print(f"Successfully connected to {db_filename}")
-
-        # --- Create the asset_types table ---
-        # This table is a simple lookup for asset type names.
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS asset_types (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL UNIQUE
-            )
-        ''')
-        print("Table 'asset_types' created or already exists.")
-
-        # --- Create the data_points table ---
-        # This table stores the main data point configurations.
-        # 'identifiers' and 'asset_types' will be stored as TEXT containing JSON arrays.
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS data_points (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL UNIQUE,
-                identifiers TEXT,
-                asset_types TEXT,
-                data_type TEXT NOT NULL,
-                range_min REAL,
-                range_max REAL,
-                string_options TEXT
-            )
-        ''')
-        print("Table 'data_points' created or already exists.")
+        print(f"Successfully connected to {DB_FILENAME}")
 
-        # --- Populate asset_types with default values if it's empty ---
-        cursor.execute("SELECT COUNT(*) FROM asset_types")
-        if cursor.fetchone()[0] == 0:
-            print("Populating 'asset_types' with default values...")
-            default_types = [
-                ("DG",), ("HVAC",), ("SOLAR Inverter",),
-                ("Sub-Meter",), ("Temp Sensor",), ("Hum Sensor",)
-            ]
-            cursor.executemany("INSERT INTO asset_types (name) VALUES (?)", default_types)
-            print(f"{len(default_types)} default asset types inserted.")
+        inserted = create_schema(cursor)
+        print("Tables 'asset_types', 'data_points', 'data_point_identifiers' and 'data_point_asset_types' created or already exist.")
+        if inserted:
+            print(f"{inserted} default asset types inserted.")
         else:
-            print("'asset_types' table already contains data. Skipping population.")
+            print("'asset_types' table already contains the default values. Skipping population.")
 
         # Commit the changes and close the connection
         conn.commit()